@@ -4,21 +4,38 @@ by freakms - ich schwöre feierlich ich bin ein tunichtgut
 """
 import asyncio
 import logging
-import os
+import random
+from collections import OrderedDict
 from datetime import timedelta
+from functools import partial
 from pathlib import Path
 
 import aiohttp
-import async_timeout
+from yarl import URL
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.const import EVENT_HOMEASSISTANT_STARTED
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
+try:
+    from homeassistant.components.http import StaticPathConfig
+except ImportError:  # HA < 2024.6: nur register_static_path vorhanden
+    StaticPathConfig = None
+
+try:
+    # orjson-basierter Parser den HA selbst mitbringt
+    from homeassistant.util.json import json_loads
+except ImportError:  # HA < 2023.2
+    from orjson import loads as json_loads
+
+from .classifier import get_einsatz_type
 from .const import (
     DOMAIN,
+    ALARM_COALESCE_DELAY,
     CONF_URL,
     CONF_TOKEN,
     CONF_POLL_INTERVAL,
@@ -34,9 +51,23 @@ from .const import (
     DEFAULT_POLL_INTERVAL,
     DEFAULT_USE_WEBSOCKET,
     DEFAULT_SPEAKER_MESSAGE,
+    DEFAULT_LIGHT_COLOR,
     DEFAULT_LIGHT_DURATION,
     EVENT_NEW_ALARM,
+    LIGHT_COLOR_RGB,
+    NOTIFIED_ALARM_IDS_MAX,
     PLATFORMS,
+    WS_BACKOFF_BASE,
+    WS_BACKOFF_BASE_RETRY_LATER,
+    WS_BACKOFF_MAX,
+    WS_CLOSE_CODES_RETRY_LATER,
+    WS_CONNECT_TIMEOUT,
+    WS_FALLBACK_POLL_INTERVAL,
+    WS_HEARTBEAT,
+    WS_RECEIVE_TIMEOUT,
+    WS_STABLE_AFTER,
+    WS_COMPRESS,
+    WS_MAX_RETRIES,
     SPEAKER_TYPE_ALEXA,
     SPEAKER_TYPE_SONOS,
     SPEAKER_TYPE_GOOGLE,
@@ -50,6 +81,46 @@ CARD_FILENAME = "einsatz-monitor-card.js"
 CARD_VERSION = "1.4.23"
 CARD_URL_PATH = f"/einsatz_monitor/{CARD_FILENAME}"
 CARD_URL_VERSIONED = f"{CARD_URL_PATH}?v={CARD_VERSION}"
+# Merker in hass.data[DOMAIN]: Card in diesem Prozess schon registriert
+DATA_CARD_REGISTERED = "_card_registered"
+
+# Getrennte Timeouts je Phase: ein hängender Connect scheitert nach 3s
+# statt das komplette 10s-Budget zu verbrauchen
+POLL_TIMEOUT = aiohttp.ClientTimeout(total=10, connect=3, sock_read=5)
+
+# Felder aus dem API-Alarm die im EVENT_NEW_ALARM-Payload landen
+ALARM_EVENT_KEYS = ("keyword", "unit", "vehicles", "timestamp", "tenant_name")
+# WebSocket-Alarme lieferten nie tenant_name — Event-Inhalt je Quelle unverändert
+ALARM_EVENT_KEYS_WEBSOCKET = ("keyword", "unit", "vehicles", "timestamp")
+
+# Licht-Attribute die im Snapshot vor dem Alarm gemerkt werden
+LIGHT_SNAPSHOT_KEYS = ("brightness", "rgb_color", "color_temp", "color_mode")
+
+# Ersatzvorlage wenn die konfigurierte Nachrichtenvorlage ungültig ist
+FALLBACK_SPEAKER_MESSAGE = "Alarm: {keyword}"
+
+# Beispielwerte zum Prüfen der Vorlage — echte Strings, damit auch
+# Index-Zugriffe wie {keyword[0]} gültig bleiben
+SPEAKER_TEMPLATE_SAMPLE = {
+    "keyword": "B2 Wohnungsbrand",
+    "unit": "Florian 1",
+    "vehicles": "HLF 20, DLK 23",
+    "timestamp": "2024-01-01T12:00:00Z",
+}
+
+
+class _SafeDict(dict):
+    """format_map mapping that renders unknown placeholders as empty text."""
+
+    def __missing__(self, key):
+        return ""
+
+
+def _remember_alarm_id(notified_ids: OrderedDict, alarm_id: str) -> None:
+    """Mark an alarm as handled, evicting the oldest ID beyond the FIFO limit."""
+    notified_ids[alarm_id] = None
+    if len(notified_ids) > NOTIFIED_ALARM_IDS_MAX:
+        notified_ids.popitem(last=False)
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
@@ -80,10 +151,12 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         "coordinator": coordinator,
         "url": url,
         "token": token,
+        # Stand von data/options zum Setup-Zeitpunkt → unnötige Reloads erkennen
+        "config": (dict(entry.data), dict(entry.options)),
     }
 
     if use_websocket:
-        entry.async_create_background_task(
+        hass.data[DOMAIN][entry.entry_id]["ws_task"] = entry.async_create_background_task(
             hass,
             _start_websocket_background(hass, entry, url, token),
             f"einsatz_monitor_websocket_{entry.entry_id}"
@@ -97,26 +170,37 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
 
 async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
-    """Reload config entry when options change."""
+    """Apply option changes; reload the entry only when its data changed."""
+    # Update-Listener feuert bei jedem async_update_entry (auch Titel o.ä.) —
+    # kompletten Reload (Coordinator, WebSocket, Card) nur wenn sich
+    # entry.data geändert hat. Options betreffen nur die Benachrichtigungen
+    # und werden direkt im laufenden Coordinator übernommen.
+    entry_data = hass.data.get(DOMAIN, {}).get(entry.entry_id)
+    if entry_data:
+        old_data, old_options = entry_data["config"]
+        if old_data == dict(entry.data):
+            new_options = dict(entry.options)
+            if new_options == old_options:
+                _LOGGER.debug("Konfiguration unverändert — Reload übersprungen")
+            else:
+                entry_data["coordinator"]._recompute_options()
+                entry_data["config"] = (old_data, new_options)
+                _LOGGER.debug("Optionen ohne Reload übernommen")
+            return
     await hass.config_entries.async_reload(entry.entry_id)
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
-    # Laufende Licht-Tasks abbrechen damit kein veralteter Zustand wiederhergestellt wird
-    if entry.entry_id in hass.data.get(DOMAIN, {}):
-        coordinator = hass.data[DOMAIN][entry.entry_id].get("coordinator")
-        if coordinator:
-            for task in coordinator._active_light_tasks:
-                if not task.done():
-                    task.cancel()
-                    _LOGGER.debug("Licht-Restore-Task abgebrochen (Entry wird neu geladen)")
-            coordinator._active_light_tasks = []
-            coordinator._light_previous_states = {}
-
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id)
+        entry_data = hass.data[DOMAIN].pop(entry.entry_id)
+        coordinator = entry_data["coordinator"]
+        # WebSocket-Schleife beenden — sonst läuft sie nach einem Reload
+        # parallel zur neuen weiter
+        await coordinator.async_shutdown_websocket(entry_data.get("ws_task"))
+        # Ausstehende Timer abbrechen damit kein veralteter Zustand wiederhergestellt wird
+        coordinator.async_cancel_timers()
     return unload_ok
 
 
@@ -133,136 +217,286 @@ class EinsatzMonitorCoordinator(DataUpdateCoordinator):
         poll_interval: int,
     ) -> None:
         """Initialize the coordinator."""
+        self.poll_interval = timedelta(seconds=poll_interval)
         super().__init__(
             hass,
             _LOGGER,
             name=DOMAIN,
-            update_interval=timedelta(seconds=poll_interval),
+            update_interval=self.poll_interval,
         )
         self.entry = entry
+        # Ein DeviceInfo pro Entry, von allen Entities geteilt
+        self.device_info = DeviceInfo(
+            identifiers={(DOMAIN, entry.entry_id)},
+            name="Einsatz-Monitor",
+            manufacturer="FireCall Tracker",
+            model="Cloud API",
+        )
         self.session = session
         self.url = url
         self.token = token
+        # Poll-URL samt Token einmal bauen statt bei jedem Request neu zu kodieren
+        self._poll_url = URL(f"{url}/api/ha/poll").with_query(token=token)
         self.last_alarm_id = None
-        self._notified_alarm_ids = set()
-        self._active_light_tasks: list = []
+        self.ws_connected = False
+        # Einfügereihenfolge = Alter → ältester Eintrag wird in O(1) verdrängt
+        self._notified_alarm_ids: OrderedDict[str, None] = OrderedDict()
+        # Abbruch-Handles der async_call_later-Timer (Speaker-Stop, Licht-Restore)
+        self._speaker_stop_unsub = None
+        self._light_restore_unsub = None
         self._light_previous_states: dict = {}
         self._startup_complete = False
         self._cached_alexa_service: str | None = None
+        # Coalescing: neue Alarme sammeln und gebündelt auslösen
+        self._pending_alarms: list[tuple[str, dict]] = []
+        self._flush_unsub = None
+        # ETag der letzten Poll-Antwort für If-None-Match
+        self._etag: str | None = None
+
+        self._recompute_options()
+
+    @callback
+    def _recompute_options(self) -> None:
+        """Parse entry.options once instead of on every alarm.
+
+        Wird beim Start und bei reinen Options-Änderungen (ohne Reload,
+        siehe async_reload_entry) aufgerufen.
+        """
+        options = self.entry.options
+
+        # Speaker — unterstützt neues Format (enable_speaker) und Legacy (enable_alexa)
+        self._opt_speaker_enabled = options.get(
+            CONF_ENABLE_SPEAKER, options.get("enable_alexa", False)
+        )
+        self._opt_speaker_entity = options.get(
+            CONF_SPEAKER_ENTITY, options.get("alexa_entity", "")
+        )
+        self._opt_speaker_type = options.get(CONF_SPEAKER_TYPE, SPEAKER_TYPE_ALEXA)
+        template = options.get(
+            CONF_SPEAKER_MESSAGE,
+            options.get("alexa_message", DEFAULT_SPEAKER_MESSAGE)
+        )
+        # Vorlage einmal hier prüfen statt bei jedem Alarm Exceptions abzufangen.
+        # Unbekannte Platzhalter liefert _SafeDict als "", kaputte Syntax
+        # (z.B. einzelne "{" oder {keyword[abc]}) fällt auf die Ersatzvorlage
+        # zurück. Läuft im Coordinator-__init__ → darf niemals werfen.
+        try:
+            template.format_map(_SafeDict(SPEAKER_TEMPLATE_SAMPLE))
+        except Exception as e:
+            _LOGGER.warning(
+                "Ungültige Nachrichtenvorlage %r (%s) — verwende %r",
+                template,
+                e,
+                FALLBACK_SPEAKER_MESSAGE,
+            )
+            template = FALLBACK_SPEAKER_MESSAGE
+        self._opt_speaker_template = template
+
+        # Licht
+        light_entities = options.get(CONF_LIGHT_ENTITIES, [])
+        if isinstance(light_entities, str):
+            light_entities = [l.strip() for l in light_entities.split(",") if l.strip()]
+        self._opt_light_enabled = bool(options.get(CONF_ENABLE_LIGHT))
+        self._opt_light_entities: list[str] = list(light_entities)
+        self._opt_light_rgb = LIGHT_COLOR_RGB.get(
+            options.get(CONF_LIGHT_COLOR, DEFAULT_LIGHT_COLOR),
+            LIGHT_COLOR_RGB[DEFAULT_LIGHT_COLOR],
+        )
+        self._opt_light_duration = options.get(CONF_LIGHT_DURATION, DEFAULT_LIGHT_DURATION)
+
+    @callback
+    def async_cancel_timers(self) -> None:
+        """Cancel all pending async_call_later timers (Unload/Reload)."""
+        for attr in ("_flush_unsub", "_speaker_stop_unsub", "_light_restore_unsub"):
+            unsub = getattr(self, attr)
+            if unsub is not None:
+                unsub()
+                setattr(self, attr, None)
+        self._pending_alarms = []
+        self._light_previous_states = {}
+
+    async def async_shutdown_websocket(self, ws_task: asyncio.Task | None) -> None:
+        """Cancel the WebSocket loop and wait until it has finished."""
+        if ws_task is None or ws_task.done():
+            return
+        # Vorher als getrennt markieren, damit das finally der Schleife
+        # keinen Nachhol-Poll mehr anstößt
+        self.async_set_websocket_connected(False, refresh=False)
+        ws_task.cancel()
+        await asyncio.gather(ws_task, return_exceptions=True)
+        _LOGGER.debug("WebSocket-Task beendet (Entry wird entladen)")
+
+    @callback
+    def async_set_websocket_connected(self, connected: bool, refresh: bool = True) -> None:
+        """Switch between heartbeat polling (WebSocket up) and the configured interval."""
+        if connected == self.ws_connected:
+            return
+        self.ws_connected = connected
+        if connected:
+            # Alarme kommen per Push (inkl. async_request_refresh),
+            # Polling läuft nur noch selten als Sicherheitsnetz
+            self.update_interval = timedelta(seconds=WS_FALLBACK_POLL_INTERVAL)
+            _LOGGER.debug("WebSocket aktiv — Polling auf %ss reduziert", WS_FALLBACK_POLL_INTERVAL)
+        else:
+            # Sofort pollen: während der Verbindung zum WebSocket könnten
+            # Alarme verloren gegangen sein. Plant auch mit neuem Intervall neu.
+            self.update_interval = self.poll_interval
+            _LOGGER.debug("WebSocket getrennt — Polling wieder alle %s", self.poll_interval)
+            if refresh:
+                self.hass.async_create_task(self.async_request_refresh())
 
     async def _async_update_data(self):
         """Fetch data from API."""
         try:
-            async with async_timeout.timeout(10):
-                response = await self.session.get(
-                    f"{self.url}/api/ha/poll",
-                    params={"token": self.token},
-                )
+            # Conditional GET: unveränderte Liste → 304 ohne Body
+            headers = {"If-None-Match": self._etag} if self._etag else None
+            async with self.session.get(
+                self._poll_url,
+                headers=headers,
+                timeout=POLL_TIMEOUT,
+            ) as response:
+                if response.status == 304 and self.data is not None:
+                    return self.data
                 response.raise_for_status()
-                alarms = await response.json()
+                alarms = json_loads(await response.read())
+                self._etag = response.headers.get("ETag")
+        except aiohttp.ClientError as err:
+            raise UpdateFailed(f"Error communicating with API: {err}") from err
+        except ValueError as err:  # orjson.JSONDecodeError
+            raise UpdateFailed(f"Invalid JSON from API: {err}") from err
+
+        if alarms and len(alarms) > 0:
+            # Einsatzart einmal pro Update bestimmen — die Sensoren lesen
+            # nur noch alarm["_type"] statt bei jedem Zugriff neu zu klassifizieren
+            for alarm in alarms:
+                alarm["_type"] = get_einsatz_type(alarm.get("keyword"))
+
+            latest = alarms[0]
+            alarm_id = latest.get("id")
+
+            # Beim ersten Aufruf nach dem Start (startup_complete=False):
+            # Alle vorhandenen Alarm-IDs als "bereits bekannt" markieren
+            # damit kein Testalarm ausgelöst wird
+            if not self._startup_complete:
+                # Älteste zuerst eintragen damit beim Verdrängen
+                # die neuesten IDs erhalten bleiben (alarms[0] = neuester)
+                for alarm in reversed(alarms):
+                    aid = alarm.get("id")
+                    if aid:
+                        _remember_alarm_id(self._notified_alarm_ids, aid)
+                self._startup_complete = True
+                _LOGGER.debug(
+                    "Startup: %s bekannte Alarm-IDs geladen, keine Notifications beim Start.",
+                    len(self._notified_alarm_ids),
+                )
+            elif alarm_id:
+                # Feuert nur wenn diese ID noch nicht verarbeitet wurde
+                # (WebSocket könnte sie schon eingetragen haben)
+                self._dispatch_new_alarm(latest, "polling", ALARM_EVENT_KEYS)
 
-                if alarms and len(alarms) > 0:
-                    latest = alarms[0]
-                    alarm_id = latest.get("id")
+        else:
+            # Keine Alarme vorhanden — Startup trotzdem abschließen
+            if not self._startup_complete:
+                self._startup_complete = True
+
+        return {
+            "alarms": alarms,
+            "latest": alarms[0] if alarms else None,
+            "count": len(alarms),
+        }
 
-                    # Beim ersten Aufruf nach dem Start (startup_complete=False):
-                    # Alle vorhandenen Alarm-IDs als "bereits bekannt" markieren
-                    # damit kein Testalarm ausgelöst wird
-                    if not self._startup_complete:
-                        for alarm in alarms:
-                            aid = alarm.get("id")
-                            if aid:
-                                self._notified_alarm_ids.add(aid)
-                        self._startup_complete = True
-                        _LOGGER.debug(
-                            f"Startup: {len(self._notified_alarm_ids)} bekannte Alarm-IDs "
-                            f"geladen, keine Notifications beim Start."
-                        )
-                    elif alarm_id and alarm_id not in self._notified_alarm_ids:
-                        # Nur feuern wenn diese ID noch nicht verarbeitet wurde
-                        # (WebSocket könnte sie schon eingetragen haben)
-                        self.last_alarm_id = alarm_id
-                        self._notified_alarm_ids.add(alarm_id)
-
-                        alarm_data = {
-                            "keyword": latest.get("keyword"),
-                            "unit": latest.get("unit"),
-                            "vehicles": latest.get("vehicles"),
-                            "timestamp": latest.get("timestamp"),
-                            "tenant_name": latest.get("tenant_name"),
-                        }
-
-                        self.hass.bus.async_fire(EVENT_NEW_ALARM, alarm_data)
-                        _LOGGER.info(f"New alarm event fired (polling): {latest.get('keyword')}")
-
-                        await self._handle_alarm_notifications(alarm_data, alarm_id)
-
-                        if len(self._notified_alarm_ids) > 100:
-                            self._notified_alarm_ids = set(list(self._notified_alarm_ids)[-50:])
+    @callback
+    def _dispatch_new_alarm(
+        self, alarm: dict, source: str, event_keys: tuple[str, ...]
+    ) -> bool:
+        """Queue event and notifications for an alarm not handled yet.
+
+        Gemeinsamer Pfad für Polling und WebSocket — beide prüfen und pflegen
+        dieselbe _notified_alarm_ids, damit jede alarm_id nur einmal auslöst.
+        Ausgelöst wird gebündelt nach ALARM_COALESCE_DELAY (_async_flush_alarms).
+        event_keys legt den EVENT_NEW_ALARM-Payload fest (je Quelle verschieden).
+        Returns False wenn die Alarm-ID bereits verarbeitet wurde.
+        """
+        alarm_id = alarm.get("id")
+        if alarm_id:
+            if alarm_id in self._notified_alarm_ids:
+                _LOGGER.debug("%s: Alarm %s bereits verarbeitet, übersprungen", source, alarm_id)
+                return False
+            # Sofort eintragen, nicht erst beim Flush
+            _remember_alarm_id(self._notified_alarm_ids, alarm_id)
+            self.last_alarm_id = alarm_id
+
+        alarm_get = alarm.get
+        alarm_data = {key: alarm_get(key) for key in event_keys}
+
+        self._pending_alarms.append((source, alarm_data))
+        if self._flush_unsub is None:
+            self._flush_unsub = async_call_later(
+                self.hass, ALARM_COALESCE_DELAY, self._async_flush_alarms
+            )
+        return True
 
-                else:
-                    # Keine Alarme vorhanden — Startup trotzdem abschließen
-                    if not self._startup_complete:
-                        self._startup_complete = True
+    async def _async_flush_alarms(self, _now=None) -> None:
+        """Fire all queued alarms, then notify once for the whole burst."""
+        self._flush_unsub = None
+        pending, self._pending_alarms = self._pending_alarms, []
+        if not pending:
+            return
 
-                return {
-                    "alarms": alarms,
-                    "latest": alarms[0] if alarms else None,
-                    "count": len(alarms),
-                }
+        for source, alarm_data in pending:
+            self.hass.bus.async_fire(EVENT_NEW_ALARM, alarm_data)
+            _LOGGER.info("New alarm event fired (%s): %s", source, alarm_data["keyword"])
 
-        except aiohttp.ClientError as err:
-            raise UpdateFailed(f"Error communicating with API: {err}") from err
+        # Ein Burst (mehrere Alarme innerhalb des Fensters) ergibt eine
+        # Ansage und einen Licht-Alarm — für den zuletzt eingegangenen Alarm
+        if len(pending) > 1:
+            _LOGGER.info("%s Alarme gebündelt — Benachrichtigung für den neuesten", len(pending))
+        await self._handle_alarm_notifications(pending[-1][1])
 
-    async def _handle_alarm_notifications(self, alarm_data: dict, alarm_id: str = None):
+    async def _handle_alarm_notifications(self, alarm_data: dict):
         """Handle notifications based on user options."""
-        options = self.entry.options
+        # Speaker und Licht sind unabhängig → parallel statt nacheinander auslösen
+        labels = []
+        coros = []
 
         # Speaker-Benachrichtigung (Alexa / Sonos / Google / TTS)
-        # Unterstützt neues Format (enable_speaker) und Legacy (enable_alexa)
-        enable_speaker = options.get(CONF_ENABLE_SPEAKER, options.get("enable_alexa", False))
-        speaker_entity = options.get(CONF_SPEAKER_ENTITY, options.get("alexa_entity", ""))
-
-        if enable_speaker and speaker_entity:
-            try:
-                await self._send_speaker_notification(alarm_data, options)
-            except Exception as e:
-                _LOGGER.error(f"Speaker-Notification fehlgeschlagen: {e} — Integration läuft weiter.")
+        if self._opt_speaker_enabled and self._opt_speaker_entity:
+            labels.append("Speaker-Notification")
+            coros.append(self._send_speaker_notification(alarm_data))
 
         # Licht-Alarm
-        light_entities = options.get(CONF_LIGHT_ENTITIES, [])
-        if options.get(CONF_ENABLE_LIGHT) and light_entities:
-            try:
-                await self._activate_light_alert(alarm_data, options)
-            except Exception as e:
-                _LOGGER.error(f"Licht-Alarm fehlgeschlagen: {e} — Integration läuft weiter.")
+        if self._opt_light_enabled and self._opt_light_entities:
+            labels.append("Licht-Alarm")
+            coros.append(self._activate_light_alert(alarm_data))
+
+        if not coros:
+            return
+
+        # return_exceptions=True: ein Fehler beim Speaker verdeckt keinen beim Licht
+        results = await asyncio.gather(*coros, return_exceptions=True)
+        for label, result in zip(labels, results):
+            if isinstance(result, Exception):
+                _LOGGER.error("%s fehlgeschlagen: %s — Integration läuft weiter.", label, result)
 
-    async def _send_speaker_notification(self, alarm_data: dict, options: dict):
+    async def _send_speaker_notification(self, alarm_data: dict):
         """
         Send voice notification via speaker.
         Unterstützt: Alexa (alexa_media_player), Sonos, Google Home, generisches TTS.
         """
-        speaker_type = options.get(CONF_SPEAKER_TYPE, SPEAKER_TYPE_ALEXA)
-        speaker_entity = options.get(CONF_SPEAKER_ENTITY, options.get("alexa_entity", ""))
-        message_template = options.get(
-            CONF_SPEAKER_MESSAGE,
-            options.get("alexa_message", DEFAULT_SPEAKER_MESSAGE)
-        )
+        speaker_type = self._opt_speaker_type
+        speaker_entity = self._opt_speaker_entity
+        message_template = self._opt_speaker_template
 
         if not speaker_entity:
             _LOGGER.warning("Kein Speaker-Entity konfiguriert")
             return
 
-        try:
-            message = message_template.format(
-                keyword=alarm_data.get("keyword", "Unbekannt"),
-                unit=alarm_data.get("unit", ""),
-                vehicles=alarm_data.get("vehicles", "Keine Fahrzeuge"),
-                timestamp=alarm_data.get("timestamp", "")
-            )
-        except KeyError as e:
-            _LOGGER.warning(f"Ungültiger Platzhalter in Nachrichtenvorlage: {e}")
-            message = f"Alarm: {alarm_data.get('keyword', 'Unbekannt')}"
+        message = message_template.format_map(_SafeDict(
+            keyword=alarm_data.get("keyword", "Unbekannt"),
+            unit=alarm_data.get("unit", ""),
+            vehicles=alarm_data.get("vehicles", "Keine Fahrzeuge"),
+            timestamp=alarm_data.get("timestamp", ""),
+        ))
 
         # Wortanzahl für Wartezeit berechnen
         word_count = len(message.split())
@@ -289,7 +523,7 @@ class EinsatzMonitorCoordinator(DataUpdateCoordinator):
                         alexa_services = [s for s in all_notify if s.startswith("alexa")]
                         if alexa_services:
                             alexa_service = alexa_services[0]
-                            _LOGGER.debug(f"Alexa Service gefunden: notify.{alexa_service}")
+                            _LOGGER.debug("Alexa Service gefunden: notify.%s", alexa_service)
                     if alexa_service:
                         self._cached_alexa_service = alexa_service
 
@@ -304,12 +538,13 @@ class EinsatzMonitorCoordinator(DataUpdateCoordinator):
                             if alexa_services:
                                 alexa_service = alexa_services[0]
                                 _LOGGER.info(
-                                    f"Alexa Service nach {(wait_attempt+1)*5}s gefunden: "
-                                    f"notify.{alexa_service}"
+                                    "Alexa Service nach %ss gefunden: notify.%s",
+                                    (wait_attempt + 1) * 5,
+                                    alexa_service,
                                 )
                                 break
                             _LOGGER.debug(
-                                f"Warte auf Alexa Service... Versuch {wait_attempt+1}/3"
+                                "Warte auf Alexa Service... Versuch %s/3", wait_attempt + 1
                             )
 
                 if not alexa_service:
@@ -317,8 +552,8 @@ class EinsatzMonitorCoordinator(DataUpdateCoordinator):
                         "Alexa-Sprachausgabe: Kein Alexa notify-Service gefunden. "
                         "Bitte sicherstellen dass 'alexa_media_player' (HACS) installiert "
                         "und mit Amazon-Account verknüpft ist. "
-                        "Verfügbare notify-Services: "
-                        + str(list(self.hass.services.async_services().get("notify", {}).keys()))
+                        "Verfügbare notify-Services: %s",
+                        list(self.hass.services.async_services().get("notify", {})),
                     )
                     return
 
@@ -332,7 +567,7 @@ class EinsatzMonitorCoordinator(DataUpdateCoordinator):
                     },
                     blocking=False,
                 )
-                _LOGGER.info(f"Alexa TTS gesendet via notify.{alexa_service} an {speaker_entity}")
+                _LOGGER.info("Alexa TTS gesendet via notify.%s an %s", alexa_service, speaker_entity)
 
             elif speaker_type == SPEAKER_TYPE_SONOS:
                 # Sonos über media_player.play_media
@@ -346,7 +581,7 @@ class EinsatzMonitorCoordinator(DataUpdateCoordinator):
                     },
                     blocking=False,
                 )
-                _LOGGER.info(f"Sonos TTS gesendet an {speaker_entity}")
+                _LOGGER.info("Sonos TTS gesendet an %s", speaker_entity)
 
             elif speaker_type == SPEAKER_TYPE_GOOGLE:
                 # Google Home / Nest über tts.google_translate_say
@@ -360,7 +595,7 @@ class EinsatzMonitorCoordinator(DataUpdateCoordinator):
                     },
                     blocking=False,
                 )
-                _LOGGER.info(f"Google TTS gesendet an {speaker_entity}")
+                _LOGGER.info("Google TTS gesendet an %s", speaker_entity)
 
             elif speaker_type == SPEAKER_TYPE_GENERIC_TTS:
                 # Generisches TTS — funktioniert mit fast allen Speakern
@@ -374,51 +609,36 @@ class EinsatzMonitorCoordinator(DataUpdateCoordinator):
                     },
                     blocking=False,
                 )
-                _LOGGER.info(f"Generisches TTS gesendet an {speaker_entity}")
-
-            # Nach Ansage stoppen (verhindert Endlos-Loop)
-            async def stop_speaker():
-                await asyncio.sleep(wait_time)
-                for attempt in range(3):
-                    try:
-                        await self.hass.services.async_call(
-                            "media_player",
-                            "media_stop",
-                            {"entity_id": speaker_entity},
-                            blocking=False,
-                        )
-                        _LOGGER.debug(f"Speaker stop Versuch {attempt + 1}")
-                    except Exception:
-                        pass
-                    await asyncio.sleep(2)
-
-            self.hass.async_create_task(stop_speaker())
+                _LOGGER.info("Generisches TTS gesendet an %s", speaker_entity)
+
+            # Nach Ansage stoppen (verhindert Endlos-Loop) — Timer statt
+            # schlafendem Task; ein noch ausstehender Stop wird ersetzt
+            if self._speaker_stop_unsub is not None:
+                self._speaker_stop_unsub()
+            self._speaker_stop_unsub = async_call_later(
+                self.hass,
+                wait_time,
+                partial(self._async_stop_speaker, speaker_entity, 0),
+            )
 
         except Exception as e:
             _LOGGER.error(
-                f"Fehler bei Speaker-Benachrichtigung ({speaker_type}): {e} — "
-                f"Sprachausgabe wird übersprungen, Integration läuft weiter."
+                "Fehler bei Speaker-Benachrichtigung (%s): %s — "
+                "Sprachausgabe wird übersprungen, Integration läuft weiter.",
+                speaker_type,
+                e,
             )
             # Exception NICHT weiterwerfen — Coordinator darf nicht crashen
 
-    async def _activate_light_alert(self, alarm_data: dict, options: dict):
+    async def _activate_light_alert(self, alarm_data: dict):
         """Activate light alert — speichert vorherigen Zustand und stellt ihn danach wieder her."""
-        color_map = {
-            "red": [255, 0, 0],
-            "blue": [0, 0, 255],
-            "orange": [255, 165, 0],
-            "white": [255, 255, 255],
-        }
-        color = color_map.get(options.get(CONF_LIGHT_COLOR, "red"), [255, 0, 0])
-
-        light_entities = options.get(CONF_LIGHT_ENTITIES, [])
-        if isinstance(light_entities, str):
-            light_entities = [l.strip() for l in light_entities.split(",") if l.strip()]
+        color = self._opt_light_rgb
+        light_entities = self._opt_light_entities
 
         if not light_entities:
             return
 
-        duration = options.get(CONF_LIGHT_DURATION, DEFAULT_LIGHT_DURATION)
+        duration = self._opt_light_duration
 
         # Vorherige Zustände speichern (nur wenn kein Alarm aktiv)
         # Bei aktivem Alarm den gespeicherten Zustand NICHT überschreiben
@@ -426,10 +646,14 @@ class EinsatzMonitorCoordinator(DataUpdateCoordinator):
             for entity_id in light_entities:
                 state = self.hass.states.get(entity_id)
                 if state:
-                    attrs = dict(state.attributes)
-                    # Wenn Licht aus ist: letzte bekannte Farbe aus
-                    # 'last_color_mode' / 'hs_color' / 'color_temp' holen
-                    # damit HA nach dem Restore die richtige Farbe kennt
+                    # Nur die relevanten Attribute kopieren, nicht das ganze
+                    # Mapping (supported_features, effect_list, xy_color, ...)
+                    state_attrs = state.attributes
+                    attrs = {
+                        key: state_attrs[key]
+                        for key in LIGHT_SNAPSHOT_KEYS
+                        if key in state_attrs
+                    }
                     snapshot = {
                         "state": state.state,
                         "attributes": attrs,
@@ -438,10 +662,12 @@ class EinsatzMonitorCoordinator(DataUpdateCoordinator):
                     }
                     self._light_previous_states[entity_id] = snapshot
                     _LOGGER.debug(
-                        f"Licht-Snapshot {entity_id}: state={state.state}, "
-                        f"rgb={attrs.get('rgb_color')}, "
-                        f"color_temp={attrs.get('color_temp')}, "
-                        f"brightness={attrs.get('brightness')}"
+                        "Licht-Snapshot %s: state=%s, rgb=%s, color_temp=%s, brightness=%s",
+                        entity_id,
+                        state.state,
+                        attrs.get("rgb_color"),
+                        attrs.get("color_temp"),
+                        attrs.get("brightness"),
                     )
         previous_states = self._light_previous_states
 
@@ -456,7 +682,7 @@ class EinsatzMonitorCoordinator(DataUpdateCoordinator):
                 },
                 blocking=False,
             )
-            _LOGGER.info(f"Licht-Alarm aktiviert für {len(light_entities)} Lampen")
+            _LOGGER.info("Licht-Alarm aktiviert für %s Lampen", len(light_entities))
 
             if duration > 0:
                 # Snapshot jetzt einfrieren — spätere Änderungen am Licht
@@ -464,45 +690,75 @@ class EinsatzMonitorCoordinator(DataUpdateCoordinator):
                 frozen_states = dict(previous_states)
                 self._light_previous_states = {}  # Sofort leeren nach Snapshot
 
-                async def restore_lights():
-                    await asyncio.sleep(duration)
-                    try:
-                        for entity_id in frozen_states:
-                            # Erst auf Warmweiß setzen damit HA diesen Zustand
-                            # als letzten kennt — Tageszeit-Automation übernimmt
-                            # beim nächsten Bewegungsmelder-Trigger den Rest
-                            await self.hass.services.async_call(
-                                "light",
-                                "turn_on",
-                                {
-                                    "entity_id": entity_id,
-                                    "color_temp_kelvin": 2700,
-                                    "brightness": 200,
-                                    "transition": 1,
-                                },
-                                blocking=True,
-                            )
-                            await asyncio.sleep(1.2)
-                            await self.hass.services.async_call(
-                                "light",
-                                "turn_off",
-                                {"entity_id": entity_id},
-                                blocking=False,
-                            )
-
-                        _LOGGER.info(f"Licht-Alarm beendet nach {duration}s — auf Warmweiß zurückgesetzt")
-                    except Exception as e:
-                        _LOGGER.error(f"Fehler beim Beenden des Licht-Alarms: {e}")
-
-                task = self.hass.async_create_task(restore_lights())
-                self._active_light_tasks.append(task)
-                self._active_light_tasks = [t for t in self._active_light_tasks if not t.done()]
+                # Timer statt schlafendem Task; ein laufender Restore wird
+                # ersetzt, damit das Alarmlicht ab dem letzten Alarm leuchtet
+                if self._light_restore_unsub is not None:
+                    self._light_restore_unsub()
+                self._light_restore_unsub = async_call_later(
+                    self.hass,
+                    duration,
+                    partial(self._async_restore_lights, list(frozen_states), duration),
+                )
             else:
                 # Kein Restore — previous_states direkt leeren
                 self._light_previous_states = {}
 
         except Exception as e:
-            _LOGGER.error(f"Fehler beim Licht-Alarm: {e}")
+            _LOGGER.error("Fehler beim Licht-Alarm: %s", e)
+
+    async def _async_stop_speaker(self, speaker_entity: str, attempt: int, _now=None) -> None:
+        """Stop the speaker after the announcement (bis zu 3 Versuche im 2s-Abstand)."""
+        self._speaker_stop_unsub = None
+        try:
+            await self.hass.services.async_call(
+                "media_player",
+                "media_stop",
+                {"entity_id": speaker_entity},
+                blocking=False,
+            )
+            _LOGGER.debug("Speaker stop Versuch %s", attempt + 1)
+        except Exception:
+            pass
+        if attempt < 2:
+            self._speaker_stop_unsub = async_call_later(
+                self.hass,
+                2,
+                partial(self._async_stop_speaker, speaker_entity, attempt + 1),
+            )
+
+    async def _async_restore_lights(self, entity_ids: list, duration: int, _now=None) -> None:
+        """End the light alert — Lampen auf Warmweiß setzen und ausschalten."""
+        self._light_restore_unsub = None
+        if not entity_ids:
+            return
+        try:
+            # Restore-Payload ist für alle Lampen identisch → ein Service-Call
+            # für die ganze Gruppe statt einem pro Lampe.
+            # Erst auf Warmweiß setzen damit HA diesen Zustand
+            # als letzten kennt — Tageszeit-Automation übernimmt
+            # beim nächsten Bewegungsmelder-Trigger den Rest
+            await self.hass.services.async_call(
+                "light",
+                "turn_on",
+                {
+                    "entity_id": entity_ids,
+                    "color_temp_kelvin": 2700,
+                    "brightness": 200,
+                    "transition": 1,
+                },
+                blocking=True,
+            )
+            await asyncio.sleep(1.2)
+            await self.hass.services.async_call(
+                "light",
+                "turn_off",
+                {"entity_id": entity_ids},
+                blocking=False,
+            )
+
+            _LOGGER.info("Licht-Alarm beendet nach %ss — auf Warmweiß zurückgesetzt", duration)
+        except Exception as e:
+            _LOGGER.error("Fehler beim Beenden des Licht-Alarms: %s", e)
 
 
 async def _start_websocket_background(
@@ -519,110 +775,129 @@ async def start_websocket(
     """
     Start WebSocket connection for real-time updates.
 
-    Fix v2: WebSocket und Polling teilen coordinator._notified_alarm_ids.
-    Jede alarm_id wird sofort in BEIDEN Sets eingetragen damit keine
-    Doppelauslösung (Speaker/Licht) stattfinden kann.
+    WebSocket und Polling laufen beide über coordinator._dispatch_new_alarm
+    und teilen sich damit coordinator._notified_alarm_ids — keine
+    Doppelauslösung (Speaker/Licht).
     """
     ws_url = url.replace("https://", "wss://").replace("http://", "ws://")
     ws_url = f"{ws_url}/api/ha/ws/{token}"
     entry_id = entry.entry_id
-    notified_ids = set()
     retry_count = 0
-    max_retries = 5
+    max_retries = WS_MAX_RETRIES
+
+    @callback
+    def _set_connected(connected: bool) -> None:
+        entry_data = hass.data.get(DOMAIN, {}).get(entry_id)
+        if entry_data:
+            entry_data["coordinator"].async_set_websocket_connected(connected)
+
+    # Geteilte HA-Session einmal holen und für alle Reconnects wiederverwenden
+    session = async_get_clientsession(hass)
 
     while retry_count < max_retries:
+        next_delay_hint = None
+        connected_at = None
         try:
-            session = async_get_clientsession(hass)
-
-            async with async_timeout.timeout(10):
-                ws = await session.ws_connect(ws_url)
+            # Handshake begrenzen damit ein hängender TLS-Handshake die
+            # Reconnect-Schleife nicht blockiert. heartbeat/receive_timeout
+            # lassen aiohttp tote Verbindungen selbst erkennen,
+            # compress aktiviert permessage-deflate für die JSON-Frames.
+            ws = await asyncio.wait_for(
+                session.ws_connect(
+                    ws_url,
+                    heartbeat=WS_HEARTBEAT,
+                    autoping=True,
+                    compress=WS_COMPRESS,
+                    receive_timeout=WS_RECEIVE_TIMEOUT,
+                ),
+                WS_CONNECT_TIMEOUT,
+            )
 
             _LOGGER.info("WebSocket verbunden mit Einsatz-Monitor")
-            retry_count = 0
+            _set_connected(True)
+            connected_at = hass.loop.time()
 
-            async for msg in ws:
-                if msg.type == aiohttp.WSMsgType.TEXT:
-                    data = msg.json()
-
-                    if data.get("type") == "alarm":
-                        alarm = data.get("data", {})
-                        alarm_id = alarm.get("id")
-
-                        # Coordinator holen
-                        coordinator = None
-                        if entry_id in hass.data.get(DOMAIN, {}):
-                            coordinator = hass.data[DOMAIN][entry_id]["coordinator"]
-
-                        # Bereits verarbeitet? (von WebSocket ODER Polling)
-                        if alarm_id:
-                            already_done = alarm_id in notified_ids
-                            if coordinator:
-                                already_done = already_done or (
-                                    alarm_id in coordinator._notified_alarm_ids
-                                )
-                            if already_done:
-                                _LOGGER.debug(
-                                    f"WebSocket: Alarm {alarm_id} bereits verarbeitet, übersprungen"
+            async with ws:
+                async for msg in ws:
+                    if msg.type == aiohttp.WSMsgType.TEXT:
+                        try:
+                            data = json_loads(msg.data)
+                        except ValueError:
+                            _LOGGER.debug("WebSocket: Ungültiges JSON ignoriert: %r", msg.data)
+                            continue
+                        # Nur JSON-Objekte sind Server-Nachrichten — Arrays/Strings
+                        # würden an data.get() scheitern und einen Reconnect auslösen
+                        if not isinstance(data, dict):
+                            _LOGGER.debug("WebSocket: Nachricht ohne JSON-Objekt ignoriert: %r", msg.data)
+                            continue
+
+                        msg_type = data.get("type")
+
+                        if msg_type == "alarm":
+                            alarm = data.get("data", {})
+                            entry_data = hass.data.get(DOMAIN, {}).get(entry_id)
+                            if not entry_data:
+                                _LOGGER.warning(
+                                    "WebSocket: Kein Coordinator verfügbar für Notifications"
                                 )
                                 continue
 
-                        # Sofort in BEIDE Sets eintragen bevor Notifications
-                        if alarm_id:
-                            notified_ids.add(alarm_id)
-                            if coordinator:
-                                coordinator._notified_alarm_ids.add(alarm_id)
-                                if len(coordinator._notified_alarm_ids) > 100:
-                                    coordinator._notified_alarm_ids = set(
-                                        list(coordinator._notified_alarm_ids)[-50:]
-                                    )
-                            if len(notified_ids) > 100:
-                                notified_ids = set(list(notified_ids)[-50:])
-
-                        alarm_data = {
-                            "keyword": alarm.get("keyword"),
-                            "unit": alarm.get("unit"),
-                            "vehicles": alarm.get("vehicles"),
-                            "timestamp": alarm.get("timestamp"),
-                        }
-
-                        # Event feuern und Notifications senden
-                        hass.bus.async_fire(EVENT_NEW_ALARM, alarm_data)
-                        _LOGGER.info(
-                            f"WebSocket alarm event: {alarm.get('keyword')}"
-                        )
-
-                        if coordinator:
-                            await coordinator._handle_alarm_notifications(
-                                alarm_data, alarm_id
-                            )
-                            await coordinator.async_request_refresh()
-                        else:
-                            _LOGGER.warning(
-                                "WebSocket: Kein Coordinator verfügbar für Notifications"
-                            )
+                            coordinator = entry_data["coordinator"]
+                            if coordinator._dispatch_new_alarm(
+                                alarm, "WebSocket", ALARM_EVENT_KEYS_WEBSOCKET
+                            ):
+                                await coordinator.async_request_refresh()
 
-                    elif data.get("type") == "ping":
-                        await ws.send_str("pong")
+                        elif msg_type == "ping":
+                            # Applikations-Ping des Servers erwartet ein Text-"pong";
+                            # Protokoll-PINGs beantwortet aiohttp selbst (autoping)
+                            await ws.send_str("pong")
 
-                elif msg.type in (aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.ERROR):
-                    break
+                    elif msg.type in (aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.ERROR):
+                        break
+
+            if hass.loop.time() - connected_at < WS_STABLE_AFTER:
+                # Server nimmt an und schließt sofort wieder → Fehlversuch,
+                # sonst würde im Sekundentakt neu verbunden
+                retry_count += 1
+                _LOGGER.warning(
+                    "WebSocket kurz nach dem Verbinden geschlossen (%s/%s).",
+                    retry_count,
+                    max_retries,
+                )
+
+            if ws.close_code in WS_CLOSE_CODES_RETRY_LATER:
+                next_delay_hint = ws.close_code
+                _LOGGER.info(
+                    "WebSocket vom Server geschlossen (Code %s), "
+                    "warte länger vor dem nächsten Versuch",
+                    ws.close_code,
+                )
 
         except asyncio.TimeoutError:
             retry_count += 1
             _LOGGER.warning(
-                f"WebSocket Timeout ({retry_count}/{max_retries}). Nächster Versuch in 60s..."
+                "WebSocket Timeout (%s/%s).", retry_count, max_retries
             )
         except aiohttp.ClientResponseError as err:
             if err.status == 404:
                 _LOGGER.warning(
-                    f"WebSocket Endpoint nicht erreichbar (404). Polling läuft weiter. "
-                    f"URL: {ws_url}"
+                    "WebSocket Endpoint nicht erreichbar (404). Polling läuft weiter. "
+                    "URL: %s",
+                    ws_url,
+                )
+                return
+            if err.status in (401, 403):
+                # Token ungültig — erneute Versuche ändern daran nichts
+                _LOGGER.error(
+                    "WebSocket Authentifizierung fehlgeschlagen (%s). Token prüfen, "
+                    "Polling läuft weiter.",
+                    err.status,
                 )
                 return
             retry_count += 1
             _LOGGER.warning(
-                f"WebSocket HTTP-Fehler {err.status} ({retry_count}/{max_retries}). "
-                f"Nächster Versuch in 60s..."
+                "WebSocket HTTP-Fehler %s (%s/%s).", err.status, retry_count, max_retries
             )
         except aiohttp.ClientError as err:
             retry_count += 1
@@ -630,53 +905,75 @@ async def start_websocket(
                 _LOGGER.warning("WebSocket 404. Polling läuft weiter.")
                 return
             _LOGGER.warning(
-                f"WebSocket Verbindungsfehler ({retry_count}/{max_retries}): {err}. "
-                f"Nächster Versuch in 60s..."
+                "WebSocket Verbindungsfehler (%s/%s): %s.", retry_count, max_retries, err
             )
         except Exception as err:
             retry_count += 1
             _LOGGER.warning(
-                f"WebSocket Fehler ({retry_count}/{max_retries}): {err}. "
-                f"Nächster Versuch in 60s..."
+                "WebSocket Fehler (%s/%s): %s.", retry_count, max_retries, err
             )
+        finally:
+            # Auch bei return (404/Auth) → Polling wieder im normalen Intervall
+            _set_connected(False)
+
+        if connected_at is not None and hass.loop.time() - connected_at >= WS_STABLE_AFTER:
+            # Verbindung lief stabil — ihr Abbruch (Netzwerk-Aussetzer,
+            # Server-Neustart) zählt nicht gegen Backoff und Retry-Budget
+            retry_count = 0
 
         if retry_count >= max_retries:
             _LOGGER.warning(
-                f"WebSocket nach {max_retries} Versuchen deaktiviert. Polling läuft weiter."
+                "WebSocket nach %s Versuchen deaktiviert. Polling läuft weiter.", max_retries
             )
             return
 
-        await asyncio.sleep(60)
+        # Exponentielles Backoff mit Full Jitter — verhindert dass alle
+        # HA-Instanzen nach einem Server-Neustart im Gleichtakt reconnecten
+        # Bei 1012/1013 hat der Server explizit um eine Pause gebeten
+        base = WS_BACKOFF_BASE_RETRY_LATER if next_delay_hint else WS_BACKOFF_BASE
+        backoff = min(WS_BACKOFF_MAX, base * (2 ** retry_count))
+        delay = random.uniform(0, backoff)
+        _LOGGER.info("WebSocket: Nächster Versuch in %.1fs", delay)
+        await asyncio.sleep(delay)
 
 
 async def async_register_card(hass: HomeAssistant):
     """Register the custom Lovelace card automatically."""
+    # Static Path und Lovelace-Ressource gelten prozessweit — bei mehreren
+    # Entries bzw. Reloads nur einmal registrieren
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if domain_data.get(DATA_CARD_REGISTERED):
+        return
+    domain_data[DATA_CARD_REGISTERED] = True
+
     card_path = CARD_DIR / CARD_FILENAME
 
-    if not card_path.exists():
-        _LOGGER.error(f"Card-Datei nicht gefunden: {card_path}")
+    # Dateisystemzugriff blockiert — nicht im Event-Loop ausführen
+    if not await hass.async_add_executor_job(card_path.exists):
+        _LOGGER.error("Card-Datei nicht gefunden: %s", card_path)
         return
 
-    try:
-        from homeassistant.components.http import StaticPathConfig
-        await hass.http.async_register_static_paths([
-            StaticPathConfig(CARD_URL_PATH, str(card_path), cache_headers=False)
-        ])
-        _LOGGER.info(f"Card-Pfad registriert: {CARD_URL_PATH}")
-    except ImportError:
+    if StaticPathConfig is None:
         try:
             hass.http.register_static_path(
                 CARD_URL_PATH, str(card_path), cache_headers=False
             )
         except AttributeError:
-            _LOGGER.warning(f"Statischer Pfad konnte nicht registriert werden. "
-                            f"Manuell hinzufügen: {CARD_URL_PATH}")
+            _LOGGER.warning("Statischer Pfad konnte nicht registriert werden. "
+                            "Manuell hinzufügen: %s",
+                            CARD_URL_PATH)
             return
-    except Exception as e:
-        if "already registered" in str(e).lower():
-            _LOGGER.debug(f"Statischer Pfad bereits registriert: {CARD_URL_PATH}")
-        else:
-            _LOGGER.warning(f"Fehler beim Registrieren des statischen Pfads: {e}")
+    else:
+        try:
+            await hass.http.async_register_static_paths([
+                StaticPathConfig(CARD_URL_PATH, str(card_path), cache_headers=False)
+            ])
+            _LOGGER.info("Card-Pfad registriert: %s", CARD_URL_PATH)
+        except Exception as e:
+            if "already registered" in str(e).lower():
+                _LOGGER.debug("Statischer Pfad bereits registriert: %s", CARD_URL_PATH)
+            else:
+                _LOGGER.warning("Fehler beim Registrieren des statischen Pfads: %s", e)
 
     async def _async_register_lovelace_resource(_event=None):
         try:
@@ -687,7 +984,7 @@ async def async_register_card(hass: HomeAssistant):
 
             if LOVELACE_DOMAIN not in hass.data:
                 _LOGGER.warning(
-                    f"Lovelace nicht verfügbar. Ressource manuell hinzufügen: {CARD_URL_PATH}"
+                    "Lovelace nicht verfügbar. Ressource manuell hinzufügen: %s", CARD_URL_PATH
                 )
                 return
 
@@ -697,7 +994,7 @@ async def async_register_card(hass: HomeAssistant):
                 resources = lovelace_data.get("resources") if isinstance(lovelace_data, dict) else None
 
             if not resources or not isinstance(resources, ResourceStorageCollection):
-                _LOGGER.info(f"Lovelace-Ressourcen nicht verfügbar. Manuell hinzufügen: {CARD_URL_PATH}")
+                _LOGGER.info("Lovelace-Ressourcen nicht verfügbar. Manuell hinzufügen: %s", CARD_URL_PATH)
                 return
 
             existing = [
@@ -713,9 +1010,9 @@ async def async_register_card(hass: HomeAssistant):
                                 "url": CARD_URL_VERSIONED,
                                 "res_type": "module"
                             })
-                            _LOGGER.info(f"Card-Ressource auf {CARD_URL_VERSIONED} aktualisiert")
+                            _LOGGER.info("Card-Ressource auf %s aktualisiert", CARD_URL_VERSIONED)
                         except Exception as upd_err:
-                            _LOGGER.warning(f"Card-URL-Update fehlgeschlagen: {upd_err}")
+                            _LOGGER.warning("Card-URL-Update fehlgeschlagen: %s", upd_err)
                     else:
                         _LOGGER.debug("Card-Ressource bereits aktuell")
                 return
@@ -724,15 +1021,14 @@ async def async_register_card(hass: HomeAssistant):
                 "url": CARD_URL_VERSIONED,
                 "res_type": "module"
             })
-            _LOGGER.info(f"Lovelace-Ressource hinzugefügt: {CARD_URL_VERSIONED}")
+            _LOGGER.info("Lovelace-Ressource hinzugefügt: %s", CARD_URL_VERSIONED)
 
         except ImportError as e:
-            _LOGGER.info(f"Bitte Lovelace-Ressource manuell hinzufügen: {CARD_URL_PATH}")
+            _LOGGER.info("Bitte Lovelace-Ressource manuell hinzufügen: %s", CARD_URL_PATH)
         except Exception as e:
-            _LOGGER.warning(f"Konnte Lovelace-Ressource nicht registrieren: {e}. "
-                            f"Bitte manuell hinzufügen: {CARD_URL_PATH}")
-
-    from homeassistant.const import EVENT_HOMEASSISTANT_STARTED
+            _LOGGER.warning("Konnte Lovelace-Ressource nicht registrieren: %s. "
+                            "Bitte manuell hinzufügen: %s",
+                            e, CARD_URL_PATH)
 
     if hass.is_running:
         hass.async_create_task(_async_register_lovelace_resource())
@@ -2,15 +2,16 @@
 from __future__ import annotations
 
 import logging
-from datetime import datetime, timezone, timedelta
+from datetime import datetime, timedelta
 
 from homeassistant.components.binary_sensor import (
     BinarySensorEntity,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.util import dt as dt_util
 
 from .const import (
     DOMAIN,
@@ -47,46 +48,47 @@ class EinsatzActiveBinarySensor(CoordinatorEntity, BinarySensorEntity):
         self._attr_name = "Einsatz Status"
         self._attr_icon = "mdi:fire-alert"
         # No device_class for custom state text
-        self._entry = entry
-    
-    @property
-    def device_info(self):
-        """Return device information."""
-        return {
-            "identifiers": {(DOMAIN, self._entry.entry_id)},
-            "name": "Einsatz-Monitor",
-            "manufacturer": "FireCall Tracker",
-            "model": "Cloud API",
-        }
+        self._attr_device_info = coordinator.device_info
+        # Zeitstempel und Attribute nur bei neuen Daten berechnen
+        self._latest_ts: datetime | None = None
+        self._update_from_data()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        self._update_from_data()
+        super()._handle_coordinator_update()
+
+    def _update_from_data(self) -> None:
+        """Parse timestamp and build attributes once per coordinator update."""
+        self._latest_ts = None
+        self._attr_extra_state_attributes = {}
+        data = self.coordinator.data
+        if data and data.get("latest"):
+            latest = data["latest"]
+            self._attr_extra_state_attributes = {
+                ATTR_KEYWORD: latest.get("keyword"),
+                ATTR_VEHICLES: latest.get("vehicles"),
+                ATTR_TIMESTAMP: latest.get("timestamp"),
+            }
+            ts_str = latest.get("timestamp")
+            if ts_str:
+                try:
+                    ts = dt_util.parse_datetime(ts_str)
+                except (ValueError, TypeError):
+                    ts = None
+                # Zeitstempel ohne Zeitzone sind nicht vergleichbar → kein Einsatz
+                if ts is not None and ts.tzinfo is not None:
+                    self._latest_ts = ts
     
     @property
     def is_on(self):
         """Return true if there was an alarm in the last 30 minutes."""
-        if self.coordinator.data and self.coordinator.data.get("latest"):
-            ts_str = self.coordinator.data["latest"].get("timestamp")
-            if ts_str:
-                try:
-                    ts = datetime.fromisoformat(ts_str.replace("Z", "+00:00"))
-                    # Consider alarm "active" if within last 30 minutes
-                    if datetime.now(timezone.utc) - ts < timedelta(minutes=30):
-                        return True
-                except:
-                    pass
-        return False
+        ts = self._latest_ts
+        # Consider alarm "active" if within last 30 minutes
+        return ts is not None and dt_util.utcnow() - ts < timedelta(minutes=30)
     
     @property
     def state(self):
         """Return the state of the sensor."""
         return "Einsatz aktiv" if self.is_on else "Kein Einsatz"
-    
-    @property
-    def extra_state_attributes(self):
-        """Return extra attributes."""
-        if self.coordinator.data and self.coordinator.data.get("latest"):
-            latest = self.coordinator.data["latest"]
-            return {
-                ATTR_KEYWORD: latest.get("keyword"),
-                ATTR_VEHICLES: latest.get("vehicles"),
-                ATTR_TIMESTAMP: latest.get("timestamp"),
-            }
-        return {}
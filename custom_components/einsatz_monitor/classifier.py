@@ -0,0 +1,58 @@
+"""Incident type classification for Einsatz-Monitor alarm keywords."""
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+
+from .const import (
+    EINSATZ_TYPE_FIRE,
+    EINSATZ_TYPE_TECHNICAL,
+    EINSATZ_TYPE_HAZMAT,
+    EINSATZ_TYPE_OTHER,
+    EINSATZ_TYPE_UNKNOWN,
+)
+
+
+# Stichwort-Teilstrings je Einsatzart — Reihenfolge = Priorität
+# (ein "BRAND"-Stichwort mit "PERSON" bleibt ein Brandeinsatz)
+_EINSATZ_TYPE_NEEDLES = (
+    # Brand-Einsätze (Fire)
+    # "B1".."B5" und "B " als eine Zeichenklasse
+    (EINSATZ_TYPE_FIRE, ("BRAND", "FEUER", "B[1-5 ]", "GMA", "BMA")),
+    # Technische Hilfe / Verkehrsunfall (Technical Help / Traffic Accident)
+    # "H1".."H5" als eine Zeichenklasse; "THL" ist durch "TH" abgedeckt
+    (EINSATZ_TYPE_TECHNICAL, ("TH", "VU", "VERKEHR", "UNFALL", "H[1-5]", "HILFE", "PERSON")),
+    # Gefahrgut (Hazmat)
+    (EINSATZ_TYPE_HAZMAT, ("GEFAHRGUT", "ABC", "GSG", "GAS", "ÖL", "CHEMIE")),
+)
+
+# Pro Einsatzart eine vorkompilierte Alternation — ein Scan in der C-Engine
+# statt einem Python-Level "in" je Teilstring. Reine Teilstring-Suche
+# (keine Wortgrenzen); die Einträge oben sind deshalb Regex-Fragmente.
+# IGNORECASE statt keyword.upper(): keine Kopie des Stichworts pro Aufruf,
+# "ö" passt trotzdem auf "ÖL".
+_EINSATZ_TYPE_PATTERNS = tuple(
+    (einsatz_type, re.compile("|".join(needles), re.IGNORECASE))
+    for einsatz_type, needles in _EINSATZ_TYPE_NEEDLES
+)
+
+
+def get_einsatz_type(keyword) -> str:
+    """Determine incident type from keyword."""
+    # Nur Strings klassifizieren — eine Liste/ein Dict aus der API wäre
+    # für den Cache nicht hashbar und würde den ganzen Refresh abbrechen
+    if not keyword or not isinstance(keyword, str):
+        return EINSATZ_TYPE_UNKNOWN
+    return _classify(keyword)
+
+
+# Stichworte wiederholen sich ständig → Ergebnis pro Stichwort merken
+@lru_cache(maxsize=512)
+def _classify(keyword: str) -> str:
+    """Match a non-empty keyword against the category patterns."""
+    # Erster Treffer in Prioritätsreihenfolge gewinnt
+    for einsatz_type, pattern in _EINSATZ_TYPE_PATTERNS:
+        if pattern.search(keyword):
+            return einsatz_type
+    
+    return EINSATZ_TYPE_OTHER
@@ -31,7 +31,9 @@ from .const import (
     DEFAULT_POLL_INTERVAL,
     DEFAULT_USE_WEBSOCKET,
     DEFAULT_SPEAKER_MESSAGE,
+    DEFAULT_LIGHT_COLOR,
     DEFAULT_LIGHT_DURATION,
+    LIGHT_COLOR_RGB,
     SPEAKER_TYPE_OPTIONS,
     SPEAKER_TYPE_ALEXA,
     SPEAKER_TYPE_LABELS,
@@ -58,7 +60,7 @@ async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str,
             response.raise_for_status()
 
     except aiohttp.ClientError as err:
-        _LOGGER.error(f"Connection error: {err}")
+        _LOGGER.error("Connection error: %s", err)
         raise CannotConnect from err
 
     parts = token.split("_")
@@ -129,17 +131,12 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                 user_input[CONF_LIGHT_ENTITIES] = user_input.pop("light_entities_select")
             return self.async_create_entry(title="", data=user_input)
 
-        # Alle media_player Entities (alle Speaker-Typen)
-        media_players = [""]
-        for state in self.hass.states.async_all("media_player"):
-            media_players.append(state.entity_id)
-        media_players.sort()
+        # Alle media_player Entities (alle Speaker-Typen) — nur IDs holen,
+        # keine State-Objekte
+        media_players = [""] + sorted(self.hass.states.async_entity_ids("media_player"))
 
         # Alle Licht-Entities
-        lights = []
-        for state in self.hass.states.async_all("light"):
-            lights.append(state.entity_id)
-        lights.sort()
+        lights = sorted(self.hass.states.async_entity_ids("light"))
 
         current = self.config_entry.options
 
@@ -164,8 +161,8 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
             vol.Optional(CONF_SPEAKER_MESSAGE, default=speaker_message): str,
             # Licht-Einstellungen
             vol.Optional(CONF_ENABLE_LIGHT, default=current.get(CONF_ENABLE_LIGHT, False)): bool,
-            vol.Optional("light_entities_select", default=current_lights): cv.multi_select(dict.fromkeys(lights)),
-            vol.Optional(CONF_LIGHT_COLOR, default=current.get(CONF_LIGHT_COLOR, "red")): vol.In(["red", "blue", "orange", "white"]),
+            vol.Optional("light_entities_select", default=current_lights): cv.multi_select(lights),
+            vol.Optional(CONF_LIGHT_COLOR, default=current.get(CONF_LIGHT_COLOR, DEFAULT_LIGHT_COLOR)): vol.In(list(LIGHT_COLOR_RGB)),
             vol.Optional(CONF_LIGHT_DURATION, default=current.get(CONF_LIGHT_DURATION, DEFAULT_LIGHT_DURATION)): vol.All(vol.Coerce(int), vol.Range(min=0, max=3600)),
         })
 
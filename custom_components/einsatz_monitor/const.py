@@ -48,15 +48,57 @@ SPEAKER_TYPE_LABELS = {
     SPEAKER_TYPE_GENERIC_TTS: "Generisches TTS (tts.speak)",
 }
 
+# Einsatzarten (aus dem Stichwort abgeleitet, siehe classifier.py)
+EINSATZ_TYPE_FIRE = "fire"
+EINSATZ_TYPE_TECHNICAL = "technical"
+EINSATZ_TYPE_HAZMAT = "hazmat"
+EINSATZ_TYPE_OTHER = "other"
+EINSATZ_TYPE_UNKNOWN = "unknown"
+
+# Licht-Farben (RGB)
+LIGHT_COLOR_RGB = {
+    "red": (255, 0, 0),
+    "blue": (0, 0, 255),
+    "orange": (255, 165, 0),
+    "white": (255, 255, 255),
+}
+
 # Defaults
 DEFAULT_POLL_INTERVAL = 30
 DEFAULT_USE_WEBSOCKET = True
 DEFAULT_SPEAKER_MESSAGE = "Achtung Alarm! {keyword}. Fahrzeuge: {vehicles}"
 DEFAULT_LIGHT_DURATION = 60
+DEFAULT_LIGHT_COLOR = "red"
 
 # Legacy default
 DEFAULT_ALEXA_MESSAGE = DEFAULT_SPEAKER_MESSAGE
 
+# WebSocket reconnect (exponentielles Backoff mit Full Jitter, Sekunden)
+WS_BACKOFF_BASE = 1
+WS_BACKOFF_MAX = 600
+WS_MAX_RETRIES = 10
+# Server fordert Pause an: 1012 = Service Restart, 1013 = Try Again Later
+WS_CLOSE_CODES_RETRY_LATER = (1012, 1013)
+WS_BACKOFF_BASE_RETRY_LATER = 60
+
+# WebSocket Verbindung (Sekunden)
+WS_CONNECT_TIMEOUT = 10
+WS_HEARTBEAT = 25
+WS_RECEIVE_TIMEOUT = 60
+# Verbindung gilt nach so langer Laufzeit als stabil — ein späterer
+# Abbruch ist kein Fehlversuch
+WS_STABLE_AFTER = 60
+# permessage-deflate (zlib-Fenstergröße, 15 = Maximum)
+WS_COMPRESS = 15
+# Polling als reines Sicherheitsnetz solange der WebSocket aktiv ist
+WS_FALLBACK_POLL_INTERVAL = 300
+
+# Dedup: so viele zuletzt verarbeitete Alarm-IDs merken (FIFO)
+NOTIFIED_ALARM_IDS_MAX = 100
+
+# Alarme innerhalb dieses Fensters (Sekunden) gesammelt auslösen
+ALARM_COALESCE_DELAY = 0.2
+
 # Platforms
 PLATFORMS = ["sensor", "binary_sensor"]
 
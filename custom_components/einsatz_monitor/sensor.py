@@ -1,9 +1,15 @@
 """Sensor platform for Einsatz-Monitor."""
 from __future__ import annotations
 
-import logging
 import json
+import logging
 from datetime import datetime, timezone, timedelta
+from itertools import islice
+
+try:
+    import orjson
+except ImportError:  # orjson kommt mit HA, ist aber keine deklarierte Abhängigkeit
+    orjson = None
 
 from homeassistant.components.sensor import (
     SensorEntity,
@@ -11,9 +17,10 @@ from homeassistant.components.sensor import (
     SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.util import dt as dt_util
 
 from .const import (
     DOMAIN,
@@ -24,31 +31,29 @@ from .const import (
     ATTR_TENANT_NAME,
     ATTR_ALARM_COUNT,
     ATTR_LAST_ALARM,
+    EINSATZ_TYPE_FIRE,
+    EINSATZ_TYPE_TECHNICAL,
+    EINSATZ_TYPE_HAZMAT,
+    EINSATZ_TYPE_UNKNOWN,
 )
 
 _LOGGER = logging.getLogger(__name__)
 
+# JSON-Encoder einmal beim Import wählen statt pro Aufruf zu prüfen
+if orjson is not None:
+    def _dumps(obj) -> str:
+        # orjson liefert UTF-8 direkt (kein ensure_ascii nötig)
+        return orjson.dumps(obj).decode()
+else:
+    def _dumps(obj) -> str:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
 
-def get_einsatz_type(keyword: str) -> str:
-    """Determine incident type from keyword."""
-    if not keyword:
-        return "unknown"
-    
-    keyword_upper = keyword.upper()
-    
-    # Brand-Einsätze (Fire)
-    if any(k in keyword_upper for k in ["BRAND", "FEUER", "B1", "B2", "B3", "B4", "B5", "B ", "GMA", "BMA"]):
-        return "fire"
-    
-    # Technische Hilfe / Verkehrsunfall (Technical Help / Traffic Accident)
-    if any(k in keyword_upper for k in ["TH", "VU", "VERKEHR", "UNFALL", "H1", "H2", "H3", "H4", "H5", "HILFE", "THL", "PERSON"]):
-        return "technical"
-    
-    # Gefahrgut (Hazmat)
-    if any(k in keyword_upper for k in ["GEFAHRGUT", "ABC", "GSG", "GAS", "ÖL", "CHEMIE"]):
-        return "hazmat"
-    
-    return "other"
+# Icon je Einsatzart (Klassifizierung macht der Coordinator, siehe classifier.py)
+_TYPE_ICON = {
+    EINSATZ_TYPE_FIRE: "mdi:fire",
+    EINSATZ_TYPE_TECHNICAL: "mdi:car-emergency",
+    EINSATZ_TYPE_HAZMAT: "mdi:hazard-lights",
+}
 
 
 async def async_setup_entry(
@@ -77,17 +82,7 @@ class EinsatzBaseSensor(CoordinatorEntity, SensorEntity):
         """Initialize the sensor."""
         super().__init__(coordinator)
         self._attr_unique_id = f"{entry.entry_id}_{suffix}"
-        self._entry = entry
-    
-    @property
-    def device_info(self):
-        """Return device information."""
-        return {
-            "identifiers": {(DOMAIN, self._entry.entry_id)},
-            "name": "Einsatz-Monitor",
-            "manufacturer": "FireCall Tracker",
-            "model": "Cloud API",
-        }
+        self._attr_device_info = coordinator.device_info
 
 
 class EinsatzCountSensor(EinsatzBaseSensor):
@@ -103,15 +98,17 @@ class EinsatzCountSensor(EinsatzBaseSensor):
     @property
     def native_value(self):
         """Return the state of the sensor."""
-        if self.coordinator.data:
-            return self.coordinator.data.get("count", 0)
+        data = self.coordinator.data
+        if data:
+            return data.get("count", 0)
         return 0
     
     @property
     def extra_state_attributes(self):
         """Return extra attributes."""
-        if self.coordinator.data and self.coordinator.data.get("latest"):
-            latest = self.coordinator.data["latest"]
+        data = self.coordinator.data
+        latest = data.get("latest") if data else None
+        if latest:
             return {
                 ATTR_LAST_ALARM: latest.get("keyword"),
                 ATTR_TENANT_NAME: latest.get("tenant_name"),
@@ -131,34 +128,32 @@ class EinsatzKeywordSensor(EinsatzBaseSensor):
     @property
     def native_value(self):
         """Return the state of the sensor."""
-        if self.coordinator.data and self.coordinator.data.get("latest"):
-            return self.coordinator.data["latest"].get("keyword")
+        data = self.coordinator.data
+        latest = data.get("latest") if data else None
+        if latest:
+            return latest.get("keyword")
         return "Kein Einsatz"
     
     @property
     def icon(self):
         """Return dynamic icon based on incident type."""
-        if self.coordinator.data and self.coordinator.data.get("latest"):
-            keyword = self.coordinator.data["latest"].get("keyword", "")
-            einsatz_type = get_einsatz_type(keyword)
-            if einsatz_type == "fire":
-                return "mdi:fire"
-            elif einsatz_type == "technical":
-                return "mdi:car-emergency"
-            elif einsatz_type == "hazmat":
-                return "mdi:hazard-lights"
+        data = self.coordinator.data
+        latest = data.get("latest") if data else None
+        if latest:
+            return _TYPE_ICON.get(latest.get("_type", EINSATZ_TYPE_UNKNOWN), "mdi:alert")
         return "mdi:alert"
     
     @property
     def extra_state_attributes(self):
         """Return extra attributes."""
-        if self.coordinator.data and self.coordinator.data.get("latest"):
-            latest = self.coordinator.data["latest"]
+        data = self.coordinator.data
+        latest = data.get("latest") if data else None
+        if latest:
             return {
                 ATTR_UNIT: latest.get("unit"),
                 ATTR_VEHICLES: latest.get("vehicles"),
                 ATTR_TIMESTAMP: latest.get("timestamp"),
-                "einsatz_type": get_einsatz_type(latest.get("keyword", "")),
+                "einsatz_type": latest.get("_type", EINSATZ_TYPE_UNKNOWN),
             }
         return {}
 
@@ -175,8 +170,10 @@ class EinsatzVehiclesSensor(EinsatzBaseSensor):
     @property
     def native_value(self):
         """Return the state of the sensor."""
-        if self.coordinator.data and self.coordinator.data.get("latest"):
-            return self.coordinator.data["latest"].get("vehicles") or "Keine"
+        data = self.coordinator.data
+        latest = data.get("latest") if data else None
+        if latest:
+            return latest.get("vehicles") or "Keine"
         return "Keine"
 
 
@@ -189,17 +186,27 @@ class EinsatzTimestampSensor(EinsatzBaseSensor):
         self._attr_name = "Letzter Einsatz - Zeit"
         self._attr_icon = "mdi:clock"
         self._attr_device_class = SensorDeviceClass.TIMESTAMP
+        # (Roh-String, geparster Wert) — neu parsen nur wenn sich der String ändert
+        self._ts_cache: tuple[str, datetime | None] | None = None
     
     @property
     def native_value(self):
         """Return the state of the sensor."""
-        if self.coordinator.data and self.coordinator.data.get("latest"):
-            ts = self.coordinator.data["latest"].get("timestamp")
+        data = self.coordinator.data
+        latest = data.get("latest") if data else None
+        if latest:
+            ts = latest.get("timestamp")
             if ts:
+                cache = self._ts_cache
+                if cache is not None and cache[0] == ts:
+                    return cache[1]
                 try:
-                    return datetime.fromisoformat(ts.replace("Z", "+00:00"))
-                except:
-                    pass
+                    # parse_datetime versteht "Z" auch vor Python 3.11
+                    parsed = dt_util.parse_datetime(ts)
+                except (ValueError, TypeError):
+                    parsed = None
+                self._ts_cache = (ts, parsed)
+                return parsed
         return None
 
 
@@ -210,49 +217,59 @@ class EinsatzListSensor(EinsatzBaseSensor):
         super().__init__(coordinator, entry, "einsatz_liste")
         self._attr_name = "Letzte Einsätze"
         self._attr_icon = "mdi:format-list-bulleted"
+        # Liste + JSON nur bei neuen Daten bauen, nicht bei jedem State-Read
+        self._update_from_data()
 
     def _within_7_days(self, timestamp_str) -> bool:
         if not timestamp_str:
             return False
         try:
-            ts = datetime.fromisoformat(str(timestamp_str))
-            if ts.tzinfo is None:
-                ts = ts.replace(tzinfo=timezone.utc)
-            cutoff = datetime.now(timezone.utc) - timedelta(days=7)
-            return ts >= cutoff
-        except Exception:
+            # parse_datetime versteht "Z" auch vor Python 3.11
+            ts = dt_util.parse_datetime(timestamp_str)
+        except (ValueError, TypeError):
+            return False
+        if ts is None:
             return False
+        if ts.tzinfo is None:
+            ts = ts.replace(tzinfo=timezone.utc)
+        return ts >= dt_util.utcnow() - timedelta(days=7)
 
-    @property
-    def native_value(self):
-        if self.coordinator.data and self.coordinator.data.get("alarms"):
-            recent = [a for a in self.coordinator.data["alarms"] if self._within_7_days(a.get("timestamp"))]
-            return min(len(recent), 4)
-        return 0
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        self._update_from_data()
+        super()._handle_coordinator_update()
 
-    @property
-    def extra_state_attributes(self):
-        if self.coordinator.data and self.coordinator.data.get("alarms"):
-            cutoff_alarms = [
-                a for a in self.coordinator.data["alarms"]
-                if self._within_7_days(a.get("timestamp"))
-            ][:4]
+    def _update_from_data(self) -> None:
+        """Build list, JSON and count once per coordinator update."""
+        data = self.coordinator.data
+        alarms = data.get("alarms") if data else None
+        if not alarms:
+            self._attr_native_value = 0
+            self._attr_extra_state_attributes = {"einsaetze": [], "einsaetze_json": "[]", "count": 0}
+            return
 
-            einsatz_list = []
-            for alarm in cutoff_alarms:
-                keyword = alarm.get("keyword", "")
-                einsatz_list.append({
-                    "id": alarm.get("id"),
-                    "keyword": keyword,
-                    "unit": alarm.get("unit"),
-                    "vehicles": alarm.get("vehicles"),
-                    "timestamp": alarm.get("timestamp"),
-                    "type": get_einsatz_type(keyword),
-                })
+        # Nach 4 Treffern aufhören statt die ganze Liste zu filtern
+        cutoff_alarms = list(islice(
+            (a for a in alarms if self._within_7_days(a.get("timestamp"))),
+            4,
+        ))
 
-            return {
-                "einsaetze": einsatz_list,
-                "einsaetze_json": json.dumps(einsatz_list, ensure_ascii=False),
-                "count": len(einsatz_list),
+        einsatz_list = [
+            {
+                "id": alarm.get("id"),
+                "keyword": alarm.get("keyword", ""),
+                "unit": alarm.get("unit"),
+                "vehicles": alarm.get("vehicles"),
+                "timestamp": alarm.get("timestamp"),
+                "type": alarm.get("_type", EINSATZ_TYPE_UNKNOWN),
             }
-        return {"einsaetze": [], "einsaetze_json": "[]", "count": 0}
+            for alarm in cutoff_alarms
+        ]
+
+        self._attr_native_value = len(einsatz_list)
+        self._attr_extra_state_attributes = {
+            "einsaetze": einsatz_list,
+            "einsaetze_json": _dumps(einsatz_list),
+            "count": len(einsatz_list),
+        }